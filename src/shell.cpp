@@ -536,8 +536,8 @@ void Shell::visualize_jobs(const std::string& args) {
     }
     
     std::cout << "\033[1;36m📊 Running visualization: \033[1;37m" << command << "\033[0m\n";
-    std::cout << "\033[1;33mNote:\033[0m Ensure Python 3 with pandas, matplotlib, and seaborn are installed.\n";
-    std::cout << "Install with: \033[1;36mpip install pandas matplotlib seaborn\033[0m\n\n";
+    std::cout << "\033[1;33mNote:\033[0m Ensure Python 3 with pandas and matplotlib are installed (pyarrow optional).\n";
+    std::cout << "Install with: \033[1;36mpip install pandas matplotlib\033[0m\n\n";
     
     // Execute the command
     int result = system(command.c_str());
@@ -1083,8 +1083,8 @@ void Shell::show_visualization_help() {
     print_help_row("\033[1;37m# Custom log file and output\033[0m", "python3 visualize_jobs.py --gantt -l mylogs.csv -o ./charts", cmd_width, table_width);
 
     std::cout << border << "\n";
-    std::cout << "\033[1;33mNote:\033[0m Requires Python 3 with pandas, matplotlib, and seaborn packages.\n";
-    std::cout << "Install with: \033[1;36mpip install pandas matplotlib seaborn\033[0m\n\n";
+    std::cout << "\033[1;33mNote:\033[0m Requires Python 3 with pandas and matplotlib packages (pyarrow optional).\n";
+    std::cout << "Install with: \033[1;36mpip install pandas matplotlib\033[0m\n\n";
 }
 
 void Shell::save_command_history() {
@@ -4,20 +4,43 @@ ThreadShell-HPC Job Visualization Tool
 Generates Gantt charts and performance analytics from job logs
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from datetime import datetime
-import seaborn as sns
 import argparse
 import sys
 import os
 
+# Column types for the job log written by the C++ logger
+LOG_DTYPES = {
+    'JobID': 'int32',
+    'CoreID': 'int16',
+    'Duration(ms)': 'float64',  # float32 is exact only to 2**24 ms (~4.7 h)
+}
+
+# Events written by the C++ logger, in lifecycle order
+JOB_EVENTS = ['SUBMITTED', 'STARTED', 'COMPLETED', 'FAILED', 'KILLED']
+
+# Past these job counts per-bar labels / vector bars are unreadable anyway
+GANTT_LABEL_LIMIT = 200
+GANTT_RASTER_LIMIT = 500
+
 def load_job_data(log_file):
     """Load and parse job log data."""
+    import pandas as pd
+    
     try:
-        df = pd.read_csv(log_file)
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+        try:
+            # Multithreaded Arrow reader parses the ISO timestamps natively
+            df = pd.read_csv(log_file, engine='pyarrow', dtype=LOG_DTYPES,
+                             parse_dates=['Timestamp'])
+        except ImportError:
+            df = pd.read_csv(log_file, dtype=LOG_DTYPES, parse_dates=['Timestamp'])
+        # parse_dates leaves unparseable timestamps as object dtype instead
+        # of raising, which would only fail later (possibly in a worker)
+        if not pd.api.types.is_datetime64_any_dtype(df['Timestamp']):
+            raise ValueError("Timestamp column could not be parsed as dates")
+        # Categorical codes turn the many Event == '...' filters into int compares;
+        # events outside JOB_EVENTS get their own categories rather than NaN
+        extra_events = sorted(set(df.loc[~df['Event'].isin(JOB_EVENTS), 'Event'].dropna()))
+        df['Event'] = df['Event'].astype(pd.CategoricalDtype(JOB_EVENTS + extra_events))
         return df
     except FileNotFoundError:
         print(f"Error: Log file '{log_file}' not found.")
@@ -26,54 +49,64 @@ def load_job_data(log_file):
         print(f"Error reading log file: {e}")
         return None
 
-def create_gantt_chart(df, output_file='job_gantt_chart.png'):
+def create_gantt_chart(df, output_file='job_gantt_chart.png', dpi=150, tight=False):
     """Create a Gantt chart showing job execution timeline."""
-    # Process data to get job start and end times
-    job_events = df.pivot_table(
-        index='JobID', 
-        columns='Event', 
-        values='Timestamp', 
-        aggfunc='first'
-    )
-    
-    # Filter jobs that have both start and completion events
-    completed_jobs = job_events.dropna(subset=['STARTED'])
-    
-    # Calculate durations
-    for event in ['COMPLETED', 'FAILED', 'KILLED']:
-        if event in completed_jobs.columns:
-            mask = completed_jobs[event].notna()
-            completed_jobs.loc[mask, 'END_TIME'] = completed_jobs.loc[mask, event]
-    
-    # Use current time for still running jobs
-    if 'END_TIME' not in completed_jobs.columns or completed_jobs['END_TIME'].isna().any():
-        current_time = datetime.now()
-        completed_jobs['END_TIME'].fillna(current_time, inplace=True)
+    import numpy as np
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.collections import PolyCollection
+    
+    # Per-job start time and core from the STARTED event (no wide
+    # JobID x Event pivot, most of which would be NaT)
+    start_cols = ['Timestamp', 'CoreID'] if 'CoreID' in df.columns else ['Timestamp']
+    completed_jobs = (df.loc[df['Event'] == 'STARTED']
+                      .groupby('JobID')[start_cols].first()
+                      .rename(columns={'Timestamp': 'STARTED'}))
+    if 'CoreID' not in completed_jobs.columns:
+        completed_jobs['CoreID'] = 0
+    
+    # End time from the first terminal event, running jobs end now
+    end_time = (df.loc[df['Event'].isin(['COMPLETED', 'FAILED', 'KILLED'])]
+                .groupby('JobID')['Timestamp'].first())
+    completed_jobs['END_TIME'] = (end_time.reindex(completed_jobs.index)
+                                  .fillna(pd.Timestamp.now()))
     
     # Create the plot
     fig, ax = plt.subplots(figsize=(14, 8))
     
-    # Color map for different job types/priorities
-    colors = plt.cm.Set3(range(len(completed_jobs)))
+    # Color map for different job types/priorities (alpha baked into RGBA)
+    palette = plt.cm.Set3(np.arange(plt.cm.Set3.N))
+    palette[:, 3] = 0.8
+    colors = palette[np.arange(len(completed_jobs)) % len(palette)]
     
-    for i, (job_id, row) in enumerate(completed_jobs.iterrows()):
-        start_time = row['STARTED']
-        end_time = row.get('END_TIME', datetime.now())
-        duration = (end_time - start_time).total_seconds() / 60  # Duration in minutes
-        
-        # Get job details
-        job_info = df[df['JobID'] == job_id].iloc[0]
-        job_name = job_info.get('JobName', f'Job {job_id}')
-        core_id = job_info.get('CoreID', 0)
-        
-        # Plot job as horizontal bar
-        ax.barh(y=core_id, width=duration, left=start_time, 
-                height=0.6, color=colors[i % len(colors)], 
-                alpha=0.8, label=f'{job_name} (ID: {job_id})')
-        
-        # Add job ID text on the bar
-        ax.text(start_time + pd.Timedelta(minutes=duration/2), core_id, 
-                f'J{job_id}', ha='center', va='center', fontsize=8, fontweight='bold')
+    # Convert to matplotlib date numbers once so bars are plain floats
+    starts = mdates.date2num(completed_jobs['STARTED'].values)
+    widths = mdates.date2num(completed_jobs['END_TIME'].values) - starts
+    core_ids = completed_jobs['CoreID'].to_numpy()
+    
+    # All bars in one PolyCollection, vertices filled into a preallocated
+    # (N, 4, 2) buffer instead of one Rectangle (or one range tuple) per job;
+    # large charts are rasterized so vector backends emit an image, not N paths
+    x0, x1 = starts, starts + widths
+    y0, y1 = core_ids - 0.3, core_ids + 0.3
+    verts = np.empty((len(completed_jobs), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = x0
+    verts[:, 2, 0] = verts[:, 3, 0] = x1
+    verts[:, 0, 1] = verts[:, 3, 1] = y0
+    verts[:, 1, 1] = verts[:, 2, 1] = y1
+    bars = PolyCollection(verts, facecolors=colors,
+                          rasterized=len(completed_jobs) > GANTT_RASTER_LIMIT)
+    ax.add_collection(bars)
+    ax.autoscale_view()
+    ax.xaxis_date()
+    
+    # Add job ID text on the bars
+    if len(completed_jobs) <= GANTT_LABEL_LIMIT:
+        centers = starts + widths * 0.5
+        for job_id, center, core_id in zip(completed_jobs.index, centers, core_ids):
+            ax.text(center, core_id, f'J{job_id}',
+                    ha='center', va='center', fontsize=8, fontweight='bold')
     
     # Customize the plot
     ax.set_xlabel('Time', fontsize=12)
@@ -81,8 +114,12 @@ def create_gantt_chart(df, output_file='job_gantt_chart.png'):
     ax.set_title('ThreadShell-HPC Job Execution Gantt Chart', fontsize=14, fontweight='bold')
     
     # Format x-axis
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-    ax.xaxis.set_major_locator(mdates.SecondLocator(interval=30))
+    # (tick spacing and labels scale with the span; a fixed 30 s step
+    # generates millions of ticks once a running job stretches the axis
+    # to now, and a fixed %H:%M:%S label reads 00:00:00 on day ticks)
+    locator = mdates.AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
     plt.xticks(rotation=45)
     
     # Set y-axis to show core IDs
@@ -93,36 +130,64 @@ def create_gantt_chart(df, output_file='job_gantt_chart.png'):
     # Add grid
     ax.grid(True, alpha=0.3)
     
-    # Adjust layout and save
+    # Adjust layout and save (tight_layout sets the margins, so the
+    # two-pass bbox_inches='tight' render is opt-in)
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig.savefig(output_file, dpi=dpi, bbox_inches='tight' if tight else None)
+    plt.close(fig)  # release the Agg buffer; figures otherwise pile up with --all
     print(f"Gantt chart saved to: {output_file}")
     return fig
 
-def create_performance_dashboard(df, output_file='performance_dashboard.png'):
+def compute_job_stats(df):
+    """Compute the aggregates shared by the dashboard and summary report."""
+    import numpy as np
+    import pandas as pd
+    
+    stats = {
+        'event_counts': df['Event'].value_counts(),
+        'submissions_per_hour': np.bincount(
+            # NaT timestamps give NaN hours, which bincount cannot cast
+            df.loc[df['Event'] == 'SUBMITTED', 'Timestamp'].dt.hour
+              .dropna().to_numpy(dtype=np.intp),
+            minlength=24),
+        'durations': None,
+        'core_usage': None,
+    }
+    if 'Duration(ms)' in df.columns:
+        stats['durations'] = pd.to_numeric(df['Duration(ms)'], errors='coerce').dropna().to_numpy()
+    if 'CoreID' in df.columns:
+        stats['core_usage'] = df.loc[df['Event'] == 'STARTED', 'CoreID'].value_counts().sort_index()
+    return stats
+
+def create_performance_dashboard(df, output_file='performance_dashboard.png', stats=None,
+                                 dpi=150, tight=False):
     """Create a comprehensive performance dashboard."""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
+    if stats is None:
+        stats = compute_job_stats(df)
+    
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
     
     # 1. Job Status Distribution
-    status_counts = df['Event'].value_counts()
+    status_counts = stats['event_counts']
+    status_counts = status_counts[status_counts > 0]
     ax1.pie(status_counts.values, labels=status_counts.index, autopct='%1.1f%%', startangle=90)
     ax1.set_title('Job Status Distribution', fontsize=14, fontweight='bold')
     
     # 2. Jobs Timeline
-    job_timeline = df[df['Event'] == 'SUBMITTED'].copy()
-    job_timeline['Hour'] = job_timeline['Timestamp'].dt.hour
-    jobs_per_hour = job_timeline.groupby('Hour').size()
+    jobs_per_hour = stats['submissions_per_hour']
     
-    ax2.bar(jobs_per_hour.index, jobs_per_hour.values, color='skyblue', alpha=0.7)
+    ax2.bar(np.arange(24), jobs_per_hour, color='skyblue', alpha=0.7)
     ax2.set_xlabel('Hour of Day')
     ax2.set_ylabel('Number of Jobs Submitted')
     ax2.set_title('Job Submission Timeline', fontsize=14, fontweight='bold')
     ax2.grid(True, alpha=0.3)
     
     # 3. Job Duration Distribution
-    if 'Duration(ms)' in df.columns:
-        durations = pd.to_numeric(df['Duration(ms)'], errors='coerce').dropna()
-        durations_seconds = durations / 1000  # Convert to seconds
+    if stats['durations'] is not None:
+        durations_seconds = stats['durations'] / 1000  # Convert to seconds
         
         ax3.hist(durations_seconds, bins=20, color='lightgreen', alpha=0.7, edgecolor='black')
         ax3.set_xlabel('Duration (seconds)')
@@ -131,8 +196,8 @@ def create_performance_dashboard(df, output_file='performance_dashboard.png'):
         ax3.grid(True, alpha=0.3)
     
     # 4. Core Utilization
-    if 'CoreID' in df.columns:
-        core_usage = df[df['Event'] == 'STARTED']['CoreID'].value_counts().sort_index()
+    if stats['core_usage'] is not None:
+        core_usage = stats['core_usage']
         ax4.bar(core_usage.index, core_usage.values, color='orange', alpha=0.7)
         ax4.set_xlabel('CPU Core ID')
         ax4.set_ylabel('Jobs Executed')
@@ -140,49 +205,73 @@ def create_performance_dashboard(df, output_file='performance_dashboard.png'):
         ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig.savefig(output_file, dpi=dpi, bbox_inches='tight' if tight else None)
+    plt.close(fig)  # release the Agg buffer; figures otherwise pile up with --all
     print(f"Performance dashboard saved to: {output_file}")
     return fig
 
-def generate_summary_report(df, output_file='job_summary.txt'):
+def generate_summary_report(df, output_file='job_summary.txt', stats=None):
     """Generate a text summary report of job statistics."""
+    import numpy as np
+    from datetime import datetime
+    
+    if stats is None:
+        stats = compute_job_stats(df)
+    
+    parts = []
+    parts.append("ThreadShell-HPC Job Execution Summary Report\n")
+    parts.append("=" * 50 + "\n\n")
+    
+    # Basic statistics
+    total_jobs = df['JobID'].nunique()
+    parts.append(f"Total Jobs Processed: {total_jobs}\n")
+    
+    # Job status breakdown
+    parts.append("\nJob Status Breakdown:\n")
+    for event in JOB_EVENTS:
+        count = stats['event_counts'].get(event, 0)
+        parts.append(f"  {event}: {count}\n")
+    
+    # Duration statistics
+    durations = stats['durations']
+    if durations is not None and durations.size:
+        lo, med, hi = np.percentile(durations, [0, 50, 100])
+        parts.append(f"\nExecution Time Statistics:\n"
+                     f"  Average Duration: {durations.mean():.2f} ms\n"
+                     f"  Median Duration: {med:.2f} ms\n"
+                     f"  Min Duration: {lo:.2f} ms\n"
+                     f"  Max Duration: {hi:.2f} ms\n")
+    
+    # Core utilization
+    if stats['core_usage'] is not None:
+        cores_used = len(stats['core_usage'])
+        parts.append(f"\nResource Utilization:\n")
+        parts.append(f"  CPU Cores Used: {cores_used}\n")
+    
+    # Time span
+    time_span = df['Timestamp'].max() - df['Timestamp'].min()
+    parts.append(f"\nTime Span: {time_span}\n")
+    
+    parts.append(f"\nReport generated on: {datetime.now()}\n")
+    
+    # Write the whole report at once instead of one write per line
     with open(output_file, 'w') as f:
-        f.write("ThreadShell-HPC Job Execution Summary Report\n")
-        f.write("=" * 50 + "\n\n")
-        
-        # Basic statistics
-        total_jobs = df['JobID'].nunique()
-        f.write(f"Total Jobs Processed: {total_jobs}\n")
-        
-        # Job status breakdown
-        f.write("\nJob Status Breakdown:\n")
-        for event in ['SUBMITTED', 'STARTED', 'COMPLETED', 'FAILED', 'KILLED']:
-            count = len(df[df['Event'] == event])
-            f.write(f"  {event}: {count}\n")
-        
-        # Duration statistics
-        if 'Duration(ms)' in df.columns:
-            durations = pd.to_numeric(df['Duration(ms)'], errors='coerce').dropna()
-            f.write(f"\nExecution Time Statistics:\n")
-            f.write(f"  Average Duration: {durations.mean():.2f} ms\n")
-            f.write(f"  Median Duration: {durations.median():.2f} ms\n")
-            f.write(f"  Min Duration: {durations.min():.2f} ms\n")
-            f.write(f"  Max Duration: {durations.max():.2f} ms\n")
-        
-        # Core utilization
-        if 'CoreID' in df.columns:
-            cores_used = df[df['Event'] == 'STARTED']['CoreID'].nunique()
-            f.write(f"\nResource Utilization:\n")
-            f.write(f"  CPU Cores Used: {cores_used}\n")
-        
-        # Time span
-        time_span = df['Timestamp'].max() - df['Timestamp'].min()
-        f.write(f"\nTime Span: {time_span}\n")
-        
-        f.write(f"\nReport generated on: {datetime.now()}\n")
+        f.write(''.join(parts))
     
     print(f"Summary report saved to: {output_file}")
 
+def _available_cpus():
+    """Number of CPUs this process may run on (affinity aware, ignores CPU quotas)."""
+    if hasattr(os, 'process_cpu_count'):  # Python 3.13+
+        return os.process_cpu_count() or 1
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _run_output(func, df, output_file, kwargs):
+    """Generate one output, keeping the figure inside the calling process."""
+    func(df, output_file, **kwargs)
+
 def main():
     parser = argparse.ArgumentParser(description='ThreadShell-HPC Job Visualization Tool')
     parser.add_argument('--log-file', '-l', default='logs/job_log.csv', 
@@ -197,6 +286,10 @@ def main():
                        help='Generate summary report')
     parser.add_argument('--all', action='store_true', 
                        help='Generate all visualizations and reports')
+    parser.add_argument('--dpi', type=int, default=150, 
+                       help='Resolution of generated images (default: 150)')
+    parser.add_argument('--tight', action='store_true', 
+                       help="Crop images with bbox_inches='tight' (renders each figure twice)")
     
     args = parser.parse_args()
     
@@ -212,18 +305,41 @@ def main():
     # Create output directory
     os.makedirs(args.output_dir, exist_ok=True)
     
-    # Generate requested outputs
+    # Aggregates shared by the dashboard and report, computed in one place
+    stats = None
+    if args.all or args.dashboard or args.report:
+        stats = compute_job_stats(df)
+    
+    # Collect requested outputs
+    tasks = []
     if args.all or args.gantt:
         gantt_file = os.path.join(args.output_dir, 'job_gantt_chart.png')
-        create_gantt_chart(df, gantt_file)
+        tasks.append((create_gantt_chart, gantt_file,
+                      {'dpi': args.dpi, 'tight': args.tight}))
     
     if args.all or args.dashboard:
         dashboard_file = os.path.join(args.output_dir, 'performance_dashboard.png')
-        create_performance_dashboard(df, dashboard_file)
+        tasks.append((create_performance_dashboard, dashboard_file,
+                      {'stats': stats, 'dpi': args.dpi, 'tight': args.tight}))
     
     if args.all or args.report:
         report_file = os.path.join(args.output_dir, 'job_summary.txt')
-        generate_summary_report(df, report_file)
+        tasks.append((generate_summary_report, report_file, {'stats': stats}))
+    
+    # Outputs are independent; render them side by side when there are
+    # several and more than one CPU to run them on
+    workers = min(len(tasks), _available_cpus())
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_output, func, df, output_file, kwargs)
+                       for func, output_file, kwargs in tasks]
+            for future in futures:
+                future.result()
+    else:
+        for func, output_file, kwargs in tasks:
+            _run_output(func, df, output_file, kwargs)
     
     if not any([args.gantt, args.dashboard, args.report, args.all]):
         print("No output specified. Use --all to generate all outputs.")